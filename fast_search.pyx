@@ -0,0 +1,68 @@
+# cython: language_level=3, boundscheck=False, wraparound=False
+"""
+C implementation of the longest path kernel of `game_agent.custom_score`.
+
+Build in place with `python setup.py build_ext --inplace`; `game_agent` falls
+back to its pure Python implementation if this extension is not built. Boards
+are encoded as bitmasks where square (r, c) maps to bit r + c * height, so
+only boards with at most 64 squares are supported.
+"""
+
+# Largest supported board, in squares
+MAX_SQUARES = 64
+
+cdef extern from *:
+    int __builtin_ctzll(unsigned long long)
+
+
+def longest_path(mask, int sq, masks, cache=None):
+    """Return the length of the longest knight path starting at square index
+    `sq` that only visits the open squares in `mask`; same interface as
+    `game_agent.longest_path`, memoizing sub-results in `cache` keyed on
+    (mask, sq).
+    """
+    cdef unsigned long long c_masks[64]
+    # Post-order DFS stack; a path visits each square at most once
+    cdef unsigned long long stack_m[65]
+    cdef unsigned long long stack_nb[65]
+    cdef int stack_s[65]
+    cdef int stack_best[65]
+    cdef unsigned long long m, nb, b
+    cdef int i, top, s, best, n = len(masks)
+    if n > MAX_SQUARES:
+        raise ValueError("fast_search supports boards of at most %d squares" % MAX_SQUARES)
+    if cache is None:
+        cache = {}
+    length = cache.get((mask, sq))
+    if length is not None:
+        return length
+    for i in range(n):
+        c_masks[i] = masks[i]
+    stack_m[0] = mask
+    stack_s[0] = sq
+    stack_nb[0] = c_masks[sq] & stack_m[0]
+    stack_best[0] = 0
+    top = 0
+    while top >= 0:
+        nb = stack_nb[top]
+        if nb:
+            b = nb & (~nb + 1)
+            stack_nb[top] = nb ^ b
+            m = stack_m[top] ^ b
+            s = __builtin_ctzll(b)
+            length = cache.get((m, s))
+            if length is None:
+                top += 1
+                stack_m[top] = m
+                stack_s[top] = s
+                stack_nb[top] = c_masks[s] & m
+                stack_best[top] = 0
+            elif <int>length + 1 > stack_best[top]:
+                stack_best[top] = <int>length + 1
+        else:
+            best = stack_best[top]
+            cache[(stack_m[top], stack_s[top])] = best
+            top -= 1
+            if top >= 0 and best + 1 > stack_best[top]:
+                stack_best[top] = best + 1
+    return cache[(mask, sq)]
@@ -1,4 +1,14 @@
+import math
+import pickle
 import random
+import timeit
+from concurrent.futures import ProcessPoolExecutor, wait
+from functools import lru_cache
+
+try:
+    from fast_search import MAX_SQUARES as NATIVE_MAX_SQUARES, longest_path as native_longest_path
+except ImportError:
+    native_longest_path = None
 
 
 class SearchTimeout(Exception):
@@ -6,6 +16,239 @@ class SearchTimeout(Exception):
     pass
 
 
+try:
+    popcount = int.bit_count  # Python 3.10+
+except AttributeError:
+    def popcount(x):
+        return bin(x).count("1")
+
+# L-shaped (knight) move offsets
+DIRECTIONS = [(-2, -1), (-2, 1), (-1, -2), (-1, 2), (1, -2), (1, 2), (2, -1), (2, 1)]
+
+# Maximum number of memoized longest path sub-results kept per board size
+LONGEST_PATH_CACHE_SIZE = 2 ** 20
+
+# Number of search nodes visited between two checks of the turn timer; must
+# be a power of two. Kept small since a late-game evaluation can be costly.
+TIME_CHECK_INTERVAL = 16
+
+# Shallowest search for which root moves are farmed out to worker processes;
+# below it the pickling and scheduling costs outweigh the parallel speedup
+PARALLEL_MIN_DEPTH = 3
+
+# Maximum number of tactical leaves extended by one ply per root search
+QUIESCENCE_LIMIT = 256
+
+# Shallowest alpha-beta node without a stored best move at which a reduced
+# depth search is run first to find one
+IID_MIN_DEPTH = 4
+
+# Half-width of the aspiration window searched around the previous iterative
+# deepening score before falling back to a full window
+ASPIRATION_WINDOW = 3.0
+
+# Number of search depths for which killer moves are kept
+MAX_KILLER_DEPTH = 64
+
+# Transposition table entry flags
+EXACT, LOWER, UPPER = 0, 1, 2
+
+# Zobrist key toggled whenever the side to move changes
+ZOBRIST_SIDE = random.Random(0).getrandbits(64)
+
+
+@lru_cache(maxsize=None)
+def zobrist_tables(size):
+    """Return the (blocked, own, opponent) tables of random 64-bit keys for a
+    board with `size` squares, indexed like `Board._board_state`.
+    """
+    rng = random.Random(size)
+    return tuple([rng.getrandbits(64) for _ in range(size)] for _ in range(3))
+
+
+def zobrist_hash(game, player):
+    """Compute the Zobrist hash of a game state from the point of view of the
+    given player. The hash covers the blocked squares, the location of both
+    players and whether `player` is the side to move.
+    """
+    height = game.height
+    blocked, own, other = zobrist_tables(game.width * height)
+    key = 0
+    for idx in range(game.width * height):
+        key ^= blocked[idx]
+    for r, c in game.get_blank_spaces():
+        key ^= blocked[r + c * height]
+    for table, p in ((own, player), (other, game.get_opponent(player))):
+        loc = game.get_player_location(p)
+        if loc is not None:
+            key ^= table[loc[0] + loc[1] * height]
+    if game.active_player is player:
+        key ^= ZOBRIST_SIDE
+    return key
+
+
+def zobrist_child_keys(game, key, moves, own_to_move):
+    """Return the Zobrist hash of the state reached by each of `moves` from
+    the state of `game` hashed as `key`. `own_to_move` tells whether the
+    player the hash was computed for is the side to move.
+    """
+    height = game.height
+    blocked, own, other = zobrist_tables(game.width * height)
+    table = own if own_to_move else other
+    key ^= ZOBRIST_SIDE
+    loc = game.get_player_location(game.active_player)
+    if loc is not None:
+        key ^= table[loc[0] + loc[1] * height]
+    return [key ^ table[r + c * height] ^ blocked[r + c * height] for r, c in moves]
+
+
+@lru_cache(maxsize=None)
+def knight_masks(width, height):
+    """Return, for every square index of a `width` x `height` board, a bitmask
+    of the squares a knight can reach from it. Square (r, c) maps to bit
+    r + c * height, the same layout as `Board._board_state`.
+    """
+    masks = [0] * (width * height)
+    for c in range(width):
+        for r in range(height):
+            for dr, dc in DIRECTIONS:
+                if 0 <= r + dr < height and 0 <= c + dc < width:
+                    masks[r + c * height] |= 1 << (r + dr + (c + dc) * height)
+    return tuple(masks)
+
+
+def num_moves(mask, sq, masks):
+    """Return the number of knight moves from square index `sq` onto the open
+    squares in `mask`; any open square counts if `sq` is None (not placed).
+    """
+    if sq is None:
+        return popcount(mask)
+    return popcount(masks[sq] & mask)
+
+
+@lru_cache(maxsize=None)
+def square_bits(width, height):
+    """Return a dict mapping every square (r, c) of the board to its bit in a
+    board bitmask, 1 << (r + c * height).
+    """
+    return {(r, c): 1 << (r + c * height) for c in range(width) for r in range(height)}
+
+
+def blank_mask(game):
+    """Return the blank squares of `game` as a bitmask in which bit
+    r + c * height is set if square (r, c) is blank.
+    """
+    return sum(map(square_bits(game.width, game.height).__getitem__, game.get_blank_spaces()))
+
+
+@lru_cache(maxsize=None)
+def longest_path_cache(width, height):
+    """Return the memo shared by all `longest_path` calls on boards of the
+    given size, mapping (mask, sq) to the longest path from that state.
+    """
+    return {}
+
+
+def longest_path(mask, sq, masks, cache=None):
+    """Return the length of the longest knight path starting at square index
+    `sq` that only visits the open squares in `mask`.
+
+    Sub-results are memoized in `cache` keyed on (mask, sq), since different
+    move orders frequently lead to the same remaining board.
+    """
+    if cache is None:
+        cache = {}
+    elif len(cache) > LONGEST_PATH_CACHE_SIZE:
+        cache.clear()
+    if (mask, sq) in cache:
+        return cache[(mask, sq)]
+    # Post-order DFS; each frame is [mask, square, unexplored moves, best]
+    stack = [[mask, sq, masks[sq] & mask, 0]]
+    while stack:
+        frame = stack[-1]
+        m, s, nb, best = frame
+        if nb:
+            b = nb & -nb
+            frame[2] = nb ^ b
+            child = (m ^ b, b.bit_length() - 1)
+            length = cache.get(child)
+            if length is None:
+                stack.append([child[0], child[1], masks[child[1]] & child[0], 0])
+            elif length + 1 > best:
+                frame[3] = length + 1
+        else:
+            stack.pop()
+            cache[(m, s)] = best
+            if stack and best + 1 > stack[-1][3]:
+                stack[-1][3] = best + 1
+    return cache[(mask, sq)]
+
+
+@lru_cache(maxsize=None)
+def mirror_squares(width, height):
+    """Return a dict mapping every square of the board to its mirrored
+    location across the axes, as used by `custom_score_3`.
+    """
+    return {(r, c): (abs(r - (width - 1)), abs(c - (width - 1)))
+            for r in range(height) for c in range(width)}
+
+
+@lru_cache(maxsize=None)
+def avoidable_positions(width, height):
+    """Return the positions a knight's move away from the (theoretical)
+    centre of the board used by `custom_score_3`.
+    """
+    r, c = width / 2., height / 2.
+    return frozenset((r + dr, c + dc) for dr, dc in DIRECTIONS)
+
+
+def centre_rules(game, player, counts=None):
+    """Return the value `custom_score_3` gives a game state by its centre and
+    shadowing rules (1)-(3), or None if none of them applies. `counts` are
+    the (player, opponent) move counts if already known; they are only
+    needed by the shadowing rule.
+    """
+    width, height = game.width, game.height
+    # (*0) Calculate the (theoretical) centre
+    center = (width / 2., height / 2.)
+    loc_player = game.get_player_location(player)
+    loc_opponent = game.get_player_location(game.get_opponent(player))
+    # (1) Always take the centre!
+    if loc_player == center:
+        return float("inf")
+    # (2) If opponent has the centre, avoid a position within knight's movement at all costs to avoid shadowing
+    if loc_opponent == center:
+        if loc_player in avoidable_positions(width, height):
+            return float("-inf")
+    # (3) If we can shadow the opponent (only possible on a board with a true centre), we should!
+    # (the theoretical centre of an odd-sized board is never a square, so it
+    # can never be blank and needs no check)
+    if width % 2 != 0 and height % 2 != 0:
+        loc_mirror = mirror_squares(width, height)[loc_player] # the mirrored location of the player across the axes
+        if loc_opponent == loc_mirror:
+            if counts is None:
+                counts = move_counts(game, player)[1:]
+            if counts[0] == counts[1]:
+                return float("inf")
+    return None
+
+
+def move_counts(game, player):
+    """Return the blank-space bitmask of the board together with the number
+    of legal moves of `player` and of its opponent.
+    """
+    height = game.height
+    masks = knight_masks(game.width, height)
+    mask = blank_mask(game)
+    counts = []
+    for p in (game.active_player, game.inactive_player):
+        loc = game.get_player_location(p)
+        counts.append(num_moves(mask, None if loc is None else loc[0] + loc[1] * height, masks))
+    if game.active_player == player:
+        return mask, counts[0], counts[1]
+    return mask, counts[1], counts[0]
+
+
 def custom_score(game, player):
     """Calculate the heuristic value of a game state from the point of view
     of the given player.
@@ -28,34 +271,33 @@ def custom_score(game, player):
     float
         The heuristic value of the current game state to the specified player.
     """
-
-    if game.is_loser(player):
+    mask, player_moves, opponent_moves = move_counts(game, player)
+    if game.active_player == player and not player_moves:
         return float("-inf")
-    if game.is_winner(player):
+    if game.inactive_player == player and not opponent_moves:
         return float("inf")
 
     # Longest Path Heuristic (used towards end game)
 
-    game_phase = len(game.get_blank_spaces()) # high if early, low if late in game
-    max_phase = game.width*game.height
-
-    def longestPath(player,game,path=0,longest=0):
-        moves = game.get_legal_moves(player)
-        if path > longest:
-            longest = path
-        if len(moves) == 0:
-            path = 0
-        for move in moves:
-            new_board = game.forecast_move(move)
-            longestPath(player,new_board,path+1,longest)
-        return longest
-
-    if (game_phase<15): # only feasible to calculate late-game
-        game_phase = abs(game_phase-max_phase) # low if early, high if late in game
-        return (longestPath(player,game)-longestPath(game.get_opponent(player),game))
+    game_phase = popcount(mask) # high if early, low if late in game
+    opponent = game.get_opponent(player)
+    loc_player = game.get_player_location(player)
+    loc_opponent = game.get_player_location(opponent)
+
+    if (game_phase<15 and loc_player and loc_opponent): # only feasible to calculate late-game
+        h = game.height
+        masks = knight_masks(game.width, h)
+        cache = longest_path_cache(game.width, h)
+        lp = longest_path
+        if native_longest_path is not None and game.width*h <= NATIVE_MAX_SQUARES:
+            # Unlike longest_path, the C kernel never clears the memo
+            if len(cache) > LONGEST_PATH_CACHE_SIZE:
+                cache.clear()
+            lp = native_longest_path
+        return (lp(mask, loc_player[0] + loc_player[1] * h, masks, cache)
+                - lp(mask, loc_opponent[0] + loc_opponent[1] * h, masks, cache))
     else:
-        opponent = game.get_opponent(player)
-        return float(len(game.get_legal_moves(player)))-2.0*float(len(game.get_legal_moves(opponent)))
+        return player_moves-2.0*opponent_moves
 
 
 def custom_score_2(game, player):
@@ -80,15 +322,15 @@ def custom_score_2(game, player):
     float
         The heuristic value of the current game state to the specified player.
     """
-    if game.is_loser(player):
+    mask, player_moves, opponent_moves = move_counts(game, player)
+    if game.active_player == player and not player_moves:
         return float("-inf")
-    if game.is_winner(player):
+    if game.inactive_player == player and not opponent_moves:
         return float("inf")
 
     # Aim to maximise your own available moves vs the opponent (Factor 2)
 
-    opponent = game.get_opponent(player)
-    return float(len(game.get_legal_moves(player)))-2.0*float(len(game.get_legal_moves(opponent)))
+    return player_moves-2.0*opponent_moves
 
 
 def custom_score_3(game, player):
@@ -113,45 +355,55 @@ def custom_score_3(game, player):
     float
         The heuristic value of the current game state to the specified player.
     """
-    if game.is_loser(player):
+    mask, player_moves, opponent_moves = move_counts(game, player)
+    if game.active_player == player and not player_moves:
         return float("-inf")
-    if game.is_winner(player):
+    if game.inactive_player == player and not opponent_moves:
         return float("inf")
-    game_phase = len(game.get_blank_spaces()) # high if early, low if late
+    game_phase = popcount(mask) # high if early, low if late
 
     # Heuristic tries to take advantage of the center and shadowing if possible, otherwise stick to the centre and maximise number of moves 
 
-    # (*0) Calculate the (theoretical) centre
-    center = (game.width / 2., game.height / 2.)
-    opponent = game.get_opponent(player)
-    loc_player = game.get_player_location(player)
-    loc_opponent = game.get_player_location(opponent)
-    if game.width % 2 != 0 and game.height % 2 != 0:
-        trueCentre = True
-        loc_mirror = tuple(abs(x-(game.width-1)) for x in loc_player) # the mirrored location of the player across the axes
-    else:
-        trueCentre = False
-    # (1) Always take the centre!
-    if loc_player == center:
-        return float("inf")
-    # (2) If opponent has the centre, avoid a position within knight's movement at all costs to avoid shadowing
-    if loc_opponent == center:
-        r, c = center
-        directions = [(-2, -1), (-2, 1), (-1, -2), (-1, 2),(1, -2), (1, 2), (2, -1), (2, 1)]
-        avoidable_positions = [(r + dr, c + dc) for dr, dc in directions]
-        if loc_player in avoidable_positions:
-            return float("-inf")
-    # (3) If we can shadow the opponent, we should!
-    if trueCentre:
-        if center not in game.get_blank_spaces() and loc_opponent == loc_mirror and len(game.get_legal_moves(player)) == len(game.get_legal_moves(opponent)):
-            return float("inf")
+    # (1)-(3) Take the centre, keep away from an opponent holding it and shadow the opponent
+    value = centre_rules(game, player, (player_moves, opponent_moves))
+    if value is not None:
+        return value
     # (4) Finally, we simply return number of moves active player can make minus number of moves opponent can make minus the distance from the centre, weighted by the game phase
-    w, h = center
-    y, x = loc_player
-    dist = float((h - y)**2 + (w - x)**2)
-    return (float(len(game.get_legal_moves(player)))-2.0*float(len(game.get_legal_moves(opponent)))-dist)*game_phase
-    
-        
+    w, h = game.width / 2., game.height / 2.
+    y, x = game.get_player_location(player)
+    dist = (h - y)**2 + (w - x)**2
+    return (player_moves-2.0*opponent_moves-dist)*game_phase
+
+
+def custom_score_3_decisive(game, player):
+    """Return whether `custom_score_3` scores the game state as decided by its
+    centre and shadowing rules; the search extends such leaves by one ply.
+    """
+    return centre_rules(game, player) is not None
+
+
+custom_score_3.decisive = custom_score_3_decisive
+
+
+class OpponentStandIn:
+    """Placeholder for the opponent in the boards sent to worker processes,
+    which need not be picklable; the search only compares players by identity.
+    """
+    pass
+
+
+def search_root_moves(payload, moves, keys, args, deadline):
+    """Search the subtrees below `moves` in a worker process and return their
+    values from the point of view of the player to move at the root.
+
+    `payload` is the pickled (player, game) pair of the root, `keys` the
+    Zobrist hashes of the child states, `args` the remaining arguments of
+    the player's `_negamax` and `deadline` the `timeit.default_timer`
+    timestamp (in milliseconds) at which the parent's turn ends.
+    """
+    player, game = pickle.loads(payload)
+    player.time_left = lambda: deadline - 1000 * timeit.default_timer()
+    return [-player._negamax(game.forecast_move(m), k, *args) for m, k in zip(moves, keys)]
 
 
 class IsolationPlayer:
@@ -173,27 +425,126 @@ class IsolationPlayer:
         Time remaining (in milliseconds) when search is aborted. Should be a
         positive value large enough to allow the function to return before the
         timer expires.
+
+    workers : int (optional)
+        Number of worker processes used to search the root moves in parallel
+        (e.g. `os.cpu_count()`); the search is sequential if None. `score_fn`
+        must be picklable when set, otherwise the search stays sequential.
+        The workers are started with the player and kept between turns, and a
+        root search still running when a turn times out is not interrupted: it
+        keeps its worker busy until that turn's deadline. Call `close` once the
+        player is no longer needed to shut them down.
     """
-    def __init__(self, search_depth=3, score_fn=custom_score, timeout=20.):
+    def __init__(self, search_depth=3, score_fn=custom_score, timeout=20., workers=None):
         self.search_depth = search_depth
         self.score = score_fn
         self.time_left = None
         self.TIMER_THRESHOLD = timeout
+        self.workers = workers
+        self._pool = None
+        self._node_counter = 0
+        self._quiescence_budget = QUIESCENCE_LIMIT
+        # Transposition table: zobrist key -> (depth, value, flag, best_move)
+        self.tt = {}
+        self.start()
+
+    def __getstate__(self):
+        # Worker processes start from a fresh search state; the turn timer
+        # and the process pool cannot be pickled
+        state = self.__dict__.copy()
+        state.update(time_left=None, tt={}, _pool=None)
+        return state
+
+    def start(self):
+        """Start the worker processes of a player created with `workers`, so
+        that their start-up is not paid for inside a turn; called on creation
+        and needed again after `close`.
+        """
+        if self.workers and self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.workers)
+            # Processes are spawned as tasks arrive; run one per worker now
+            wait([self._pool.submit(int) for _ in range(self.workers)])
+
+    def close(self):
+        """Shut down the worker processes of a player created with `workers`,
+        waiting for any root search still running to reach its deadline. The
+        search is sequential until `start` is called again.
+        """
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+            self._pool = None
+
+    def _frontier_values(self, game, moves, color, extend=True):
+        """Yield the value of each of `moves` for a node one ply above the
+        search horizon, scoring the children in one pass instead of recursing
+        into a search call per leaf.
+
+        Leaves that the score function flags through a `decisive(game,
+        player)` attribute (see `custom_score_3`) are searched one ply deeper
+        while the per-root quiescence budget lasts.
+        """
+        score_fn = self.score
+        forecast_move = game.forecast_move
+        decisive = getattr(score_fn, 'decisive', None) if extend else None
+        for m in moves:
+            self._node_counter += 1
+            if not self._node_counter & (TIME_CHECK_INTERVAL - 1) and self.time_left() < self.TIMER_THRESHOLD:
+                raise SearchTimeout()
+            child = forecast_move(m)
+            if decisive is not None and self._quiescence_budget > 0 and decisive(child, self):
+                self._quiescence_budget -= 1
+                child_moves = child.get_legal_moves()
+                if child_moves:
+                    yield -max(self._frontier_values(child, child_moves, -color, False))
+                    continue
+            yield color * score_fn(child, self)
+
+    def _parallel_search(self, game, moves, keys, args, chunks):
+        """Search the subtrees below `moves` split into `chunks` worker tasks
+        and return their values in the order of `moves`.
+        """
+        payload = None
+        if self._pool is not None:
+            # Send our player and a copy of the board in which the opponent
+            # is replaced by a stand-in
+            board = game.copy()
+            opponent = game.get_opponent(self)
+            stand_in = OpponentStandIn()
+            for name, value in vars(board).items():
+                if value is opponent:
+                    setattr(board, name, stand_in)
+            try:
+                payload = pickle.dumps((self, board))
+            except (pickle.PicklingError, AttributeError, TypeError):
+                pass
+        if payload is None:
+            # Closed pool or unpicklable score_fn
+            return [-self._negamax(game.forecast_move(m), k, *args) for m, k in zip(moves, keys)]
+        deadline = 1000 * timeit.default_timer() + self.time_left()
+        futures = [self._pool.submit(search_root_moves, payload, moves[i::chunks], keys[i::chunks], args, deadline)
+                   for i in range(chunks)]
+        _, pending = wait(futures, timeout=max(0., self.time_left() - self.TIMER_THRESHOLD) / 1000.)
+        if pending:
+            for f in futures:
+                f.cancel()
+            raise SearchTimeout()
+        values = [None] * len(moves)
+        for i, f in enumerate(futures):
+            values[i::chunks] = f.result()
+        return values
 
 
 class MinimaxPlayer(IsolationPlayer):
-    """Game-playing agent that chooses a move using depth-limited minimax
-    search
+    """Game-playing agent that chooses a move using iterative deepening
+    minimax search
     """
 
     def get_move(self, game, time_left):
         """Search for the best move from the available legal moves and return a
         result before the time limit expires.
 
-        For fixed-depth search, this function simply wraps the call to the
-        minimax method, but this method provides a common interface for all
-        Isolation agents, and you will replace it in the AlphaBetaPlayer with
-        iterative deepening search.
+        Runs depth-limited minimax with iterative deepening, returning the
+        move of the deepest search that completed before the timeout.
 
         Parameters
         ----------
@@ -213,20 +564,25 @@ class MinimaxPlayer(IsolationPlayer):
             (-1, -1) if there are no available legal moves.
         """
         self.time_left = time_left
+        self.tt.clear()
 
         # Initialize the best move so that this function returns something
         # in case the search fails due to timeout
-        if not game.get_legal_moves():
+        legal_moves = game.get_legal_moves()
+        if not legal_moves:
             return (-1,-1)
-        best_move = game.get_legal_moves()[0]
+        best_move = legal_moves[0]
+        search_depth = 1
 
         try:
             # The try/except block will automatically catch the exception
             # raised when the timer is about to expire.
-            return self.minimax(game, self.search_depth)
+            while(self.time_left()>self.TIMER_THRESHOLD):
+                best_move = self.minimax(game,search_depth)
+                search_depth += 1
 
         except SearchTimeout:
-            pass  # Handle any actions required after timeout as needed
+            pass
 
         # Return the best move from the last completed search iteration
         return best_move
@@ -251,39 +607,65 @@ class MinimaxPlayer(IsolationPlayer):
             (-1, -1) if there are no legal moves
         """
 
-        def min_value(game, traversed_depth=1):
-            if self.time_left() < self.TIMER_THRESHOLD:
-                raise SearchTimeout()
-            if traversed_depth==depth:
-                return self.score(game,self)
-            traversed_depth+=1
-            v = float("inf")
-            for m in game.get_legal_moves():
-                if self.time_left() < self.TIMER_THRESHOLD:
-                    raise SearchTimeout()
-                v = min(v, max_value(game.forecast_move(m),traversed_depth))
-            return v
-
-        def max_value(game, traversed_depth=1):
-            if self.time_left() < self.TIMER_THRESHOLD:
-                raise SearchTimeout()
-            if traversed_depth==depth:
-                return self.score(game,self)
-            traversed_depth+=1
-            v = float("-inf")
-            for m in game.get_legal_moves():
-                if self.time_left() < self.TIMER_THRESHOLD:
-                    raise SearchTimeout()
-                v = max(v, min_value(game.forecast_move(m),traversed_depth))
-            return v
-            
-        return max(game.get_legal_moves(), key=lambda m: min_value(game.forecast_move(m)))
+        self._node_counter = 0
+        self._quiescence_budget = QUIESCENCE_LIMIT
+        key = zobrist_hash(game, self)
+        best_val = float("-inf")
+        best_move = (-1,-1)
+        moves = game.get_legal_moves()
+        keys = zobrist_child_keys(game, key, moves, True)
+        if self.workers and depth >= PARALLEL_MIN_DEPTH:
+            # Static partition of the root moves across the workers
+            values = self._parallel_search(game, moves, keys, (depth - 1, -1), min(self.workers, len(moves)))
+        else:
+            values = (-self._negamax(game.forecast_move(m), k, depth - 1, -1) for m, k in zip(moves, keys))
+        for move, v in zip(moves, values):
+            if v>best_val or best_move==(-1,-1):
+                best_val = v
+                best_move = move
+        return best_move
+
+    def _negamax(self, game, key, depth, color):
+        """Return the minimax value of `game` searched to `depth` plies, from
+        the point of view of the side to move; `color` is +1 when that is
+        this player and -1 otherwise. `key` is the Zobrist hash of `game`
+        used to probe and update the transposition table.
+        """
+        self._node_counter += 1
+        if not self._node_counter & (TIME_CHECK_INTERVAL - 1) and self.time_left() < self.TIMER_THRESHOLD:
+            raise SearchTimeout()
+        tt = self.tt
+        entry = tt.get(key)
+        if entry is not None and entry[0] >= depth:
+            return entry[1]
+        moves = game.get_legal_moves()
+        if depth == 0 or not moves:
+            return color * self.score(game,self)
+        forecast_move = game.forecast_move
+        negamax = self._negamax
+        if depth == 1:
+            values = self._frontier_values(game, moves, color)
+        else:
+            keys = zobrist_child_keys(game, key, moves, color > 0)
+            values = (-negamax(forecast_move(m), k, depth - 1, -color) for m, k in zip(moves, keys))
+        v = float("-inf")
+        best_move = moves[0]
+        for m, score in zip(moves, values):
+            if score>v:
+                v = score
+                best_move = m
+        tt[key] = (depth, v, EXACT, best_move)
+        return v
 
 
 class AlphaBetaPlayer(IsolationPlayer):
     """Game-playing agent that chooses a move using iterative deepening minimax
     search with alpha-beta pruning
     """
+    def __init__(self, search_depth=3, score_fn=custom_score, timeout=20., workers=None):
+        super().__init__(search_depth, score_fn, timeout, workers)
+        # Two most recent moves per remaining depth that caused a cutoff
+        self.killers = [[None, None] for _ in range(MAX_KILLER_DEPTH)]
 
     def get_move(self, game, time_left):
         """Search for the best move from the available legal moves and return a
@@ -312,18 +694,31 @@ class AlphaBetaPlayer(IsolationPlayer):
             (-1, -1) if there are no available legal moves.
         """
         self.time_left = time_left
+        self.tt.clear()
 
         # Initialize the best move so that this function returns something
         # in case the search fails due to timeout
-        if not game.get_legal_moves():
+        legal_moves = game.get_legal_moves()
+        if not legal_moves:
             return (-1,-1)
-        best_move = game.get_legal_moves()[0]
+        best_move = legal_moves[0]
+        best_val = None
         search_depth = 1
 	
         try:
             while(self.time_left()>self.TIMER_THRESHOLD):
                 last_move = best_move
-                best_move = self.alphabeta(game,search_depth)
+                if search_depth >= 3 and math.isfinite(best_val):
+                    # Aspiration window around the previous score; re-search
+                    # with a full window if the score falls outside of it
+                    alpha, beta = best_val - ASPIRATION_WINDOW, best_val + ASPIRATION_WINDOW
+                    move, v = self._search_root(game, search_depth, alpha, beta, last_move)
+                    if alpha < v < beta:
+                        best_move, best_val = move, v
+                    else:
+                        best_move, best_val = self._search_root(game, search_depth, prev_best=last_move)
+                else:
+                    best_move, best_val = self._search_root(game, search_depth, prev_best=last_move)
                 search_depth += 1
 
         except SearchTimeout:
@@ -333,7 +728,7 @@ class AlphaBetaPlayer(IsolationPlayer):
         # Return the best move from the last completed search iteration
         return best_move
 
-    def alphabeta(self, game, depth, alpha=float("-inf"), beta=float("inf")):
+    def alphabeta(self, game, depth, alpha=float("-inf"), beta=float("inf"), prev_best=None):
         """Depth-limited minimax search with alpha-beta pruning
 
         Parameters
@@ -352,46 +747,123 @@ class AlphaBetaPlayer(IsolationPlayer):
         beta : float
             Beta limits the upper bound of search on maximizing layers
 
+        prev_best : (int, int) (optional)
+            Best move of the previous iterative deepening iteration; it is
+            searched first to tighten the alpha-beta window early
+
         Returns
         -------
         (int, int)
             The board coordinates of the best move found in the current search;
             (-1, -1) if there are no legal moves
         """
+        return self._search_root(game, depth, alpha, beta, prev_best)[0]
 
-        def min_value(game, depth, alpha=float("-inf"), beta=float("inf")):
-            if self.time_left() < self.TIMER_THRESHOLD:
-                raise SearchTimeout()
-            if depth == 0 or not game.get_legal_moves():
-                return self.score(game,self)
-            v = float("inf")
-            for m in game.get_legal_moves():
-                v = min(v, max_value(game.forecast_move(m), depth - 1, alpha, beta))
-                if v<=alpha:
-                    return v
-                beta = min(beta,v)
-            return v
-
-        def max_value(game, depth, alpha=float("-inf"), beta=float("inf")):
-            if self.time_left() < self.TIMER_THRESHOLD:
-                raise SearchTimeout()
-            if depth == 0 or not game.get_legal_moves():
-                return self.score(game,self)
-            v = float("-inf")
-            for m in game.get_legal_moves():
-                v = max(v, min_value(game.forecast_move(m), depth - 1, alpha, beta))
-                if v>=beta:
-                    return v
-                alpha = max(alpha,v)
-            return v
-            
+    def _search_root(self, game, depth, alpha=float("-inf"), beta=float("inf"), prev_best=None):
+        """Run `alphabeta` and return its best move along with the value of
+        that move; the value is only a bound if it falls outside of
+        (alpha, beta).
+        """
+        self._node_counter = 0
+        self._quiescence_budget = QUIESCENCE_LIMIT
+        self.killers = [[None, None] for _ in range(MAX_KILLER_DEPTH)]
+        key = zobrist_hash(game, self)
         best_val = float("-inf")
         best_move = (-1,-1)
-        for move in game.get_legal_moves():
-            v = min_value(game.forecast_move(move), depth - 1, alpha, beta)
-            if v>best_val:
+        moves = game.get_legal_moves()
+        if prev_best in moves:
+            moves.remove(prev_best)
+            moves.insert(0, prev_best)
+        keys = zobrist_child_keys(game, key, moves, True)
+        # Search the first move sequentially to establish alpha; with workers
+        # the remaining moves are then searched in parallel against it
+        parallel = self.workers and depth >= PARALLEL_MIN_DEPTH and len(moves) > 1
+        first = 1 if parallel else len(moves)
+        for move, child_key in zip(moves[:first], keys[:first]):
+            v = -self._negamax(game.forecast_move(move), child_key, depth - 1, -beta, -alpha, -1)
+            if v>best_val or best_move==(-1,-1):
                 best_val = v
                 best_move = move
             alpha=max(alpha, best_val)
-        return best_move
-
+            if alpha>=beta:
+                break
+        if parallel and alpha<beta:
+            rest = moves[first:]
+            values = self._parallel_search(game, rest, keys[first:], (depth - 1, -beta, -alpha, -1), len(rest))
+            for move, v in zip(rest, values):
+                if v>best_val:
+                    best_val = v
+                    best_move = move
+        return best_move, best_val
+
+    def _negamax(self, game, key, depth, alpha, beta, color):
+        """Return the alpha-beta value of `game` searched to `depth` plies,
+        from the point of view of the side to move; `color` is +1 when that
+        is this player and -1 otherwise. `key` is the Zobrist hash of `game`
+        used to probe and update the transposition table.
+        """
+        self._node_counter += 1
+        if not self._node_counter & (TIME_CHECK_INTERVAL - 1) and self.time_left() < self.TIMER_THRESHOLD:
+            raise SearchTimeout()
+        tt = self.tt
+        entry = tt.get(key)
+        tt_move = entry[3] if entry is not None else None
+        if entry is not None and entry[0] >= depth:
+            if entry[2] == EXACT:
+                return entry[1]
+            if entry[2] == LOWER:
+                alpha = max(alpha, entry[1])
+            else:
+                beta = min(beta, entry[1])
+            if alpha >= beta:
+                return entry[1]
+        moves = game.get_legal_moves()
+        if depth == 0 or not moves:
+            return color * self.score(game,self)
+        # Internal iterative deepening: without a stored best move, a reduced
+        # depth search fills the table with one before the full search
+        if tt_move is None and depth >= IID_MIN_DEPTH:
+            self._negamax(game, key, depth - 2, alpha, beta, color)
+            tt_move = tt[key][3]
+        # Try the stored best move first, then the killer moves of this
+        # depth; without a stored move, prefer moves that keep the most
+        # mobility for the side to move
+        killers = self.killers[depth] if depth < MAX_KILLER_DEPTH else [None, None]
+        if tt_move not in moves and depth > 1:
+            h = game.height
+            mask = blank_mask(game)
+            masks = knight_masks(game.width, h)
+            moves.sort(key=lambda m: num_moves(mask, m[0] + m[1] * h, masks), reverse=True)
+        for m in (killers[1], killers[0], tt_move):
+            if m in moves:
+                moves.remove(m)
+                moves.insert(0, m)
+        forecast_move = game.forecast_move
+        negamax = self._negamax
+        alpha_orig = alpha
+        if depth == 1:
+            values = self._frontier_values(game, moves, color)
+        else:
+            # The generator reads alpha and beta as each child is searched
+            keys = zobrist_child_keys(game, key, moves, color > 0)
+            values = (-negamax(forecast_move(m), k, depth - 1, -beta, -alpha, -color) for m, k in zip(moves, keys))
+        v = float("-inf")
+        best_move = moves[0]
+        for m, score in zip(moves, values):
+            if score>v:
+                v = score
+                best_move = m
+            alpha = max(alpha,v)
+            if alpha>=beta:
+                if m != killers[0]:
+                    killers[1] = killers[0]
+                    killers[0] = m
+                break
+        if v<=alpha_orig:
+            flag = UPPER
+        elif v>=beta:
+            flag = LOWER
+        else:
+            flag = EXACT
+        tt[key] = (depth, v, flag, best_move)
+        return v